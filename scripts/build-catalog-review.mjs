@@ -1,6 +1,71 @@
 import fs from "node:fs";
 import path from "node:path";
 
+const BOM_PATTERN = /^\uFEFF/;
+const LINE_BREAK_PATTERN = /\r?\n/g;
+const PHOTO_EXTENSION_PATTERN = /\.(jpg|jpeg|png|webp|avif)$/i;
+const NAME_NOISE_PATTERN = /Tallas?|[$]/i;
+const DIACRITIC_PATTERN = /\p{Diacritic}/gu;
+const NON_ASCII_PATTERN = /[^\x00-\x7f]/;
+const ASCII_DIACRITIC_PATTERN = /[`^]/g;
+const NON_ALNUM_PATTERN = /[^A-Za-z0-9]+/g;
+const WHITESPACE_PATTERN = /\s+/g;
+const SPACE_BEFORE_PRICE_PATTERN = /\s+\$/g;
+const REFERENCE_PAREN_PATTERN = /\(([^)]+)\)/;
+const IMAGE_REFERENCE_PATTERN = /-(\d{3,})-[^-]+\.[A-Za-z0-9]+$/;
+const SYNTHETIC_REFERENCE_PATTERN = /^(?:P\d+R\d+$|MISSING|MANUAL)/i;
+
+const REVIEW_HEADERS = [
+  "source_page",
+  "sku_current",
+  "sku_suggested",
+  "reference_number",
+  "reference_source",
+  "name_current",
+  "name_pdf",
+  "name_suggested",
+  "category_current",
+  "category_suggested",
+  "size_current",
+  "size_suggested",
+  "price_current",
+  "price_pdf",
+  "image_filename_current",
+  "image_filename_suggested",
+  "review_status",
+  "review_notes",
+];
+
+const FINAL_HEADERS = [
+  "sku",
+  "name",
+  "category",
+  "size",
+  "color",
+  "price",
+  "cost",
+  "initial_stock",
+  "image_filename",
+  "reference_number",
+  "reference_source",
+  "source_page",
+];
+
+const CATEGORY_CODE_BY_PREFIX = new Map([
+  ["CAMI", "CAMI"],
+  ["PANT", "PANT"],
+  ["FALD", "FALD"],
+  ["ZAPA", "ZAPA"],
+  ["CALZ", "ZAPA"],
+  ["MONE", "MONE"],
+  ["BOLS", "MONE"],
+  ["CART", "MONE"],
+  ["PERF", "PERF"],
+  ["ACCE", "ACCE"],
+  ["VEST", "VEST"],
+  ["BERM", "BERM"],
+]);
+
 function parseArgs(argv) {
   const args = new Map();
   for (let i = 0; i < argv.length; i += 1) {
@@ -46,9 +111,9 @@ function parseCsvLine(line) {
 }
 
 function parseCsv(filePath) {
-  const raw = fs.readFileSync(filePath, "utf8").replace(/^\uFEFF/, "");
+  const raw = fs.readFileSync(filePath, "utf8").replace(BOM_PATTERN, "");
   const lines = raw
-    .split(/\r?\n/g)
+    .split(LINE_BREAK_PATTERN)
     .map((line) => line.trimEnd())
     .filter((line) => line.trim() !== "");
   if (lines.length === 0) throw new Error(`CSV vacio: ${filePath}`);
@@ -77,7 +142,8 @@ function writeCsv(filePath, headers, rows) {
   fs.mkdirSync(path.dirname(filePath), { recursive: true });
   const lines = [headers.join(",")];
   for (const row of rows) {
-    lines.push(headers.map((header) => csvEscape(row[header] ?? "")).join(","));
+    const values = Array.isArray(row) ? row : headers.map((header) => row[header]);
+    lines.push(values.map((value) => csvEscape(value ?? "")).join(","));
   }
   fs.writeFileSync(filePath, lines.join("\n"), "utf8");
 }
@@ -90,27 +156,27 @@ function toBool(value, fallback = false) {
   return fallback;
 }
 
+function stripAccents(value) {
+  if (!NON_ASCII_PATTERN.test(value)) return value.replace(ASCII_DIACRITIC_PATTERN, "");
+  return value.normalize("NFD").replace(DIACRITIC_PATTERN, "");
+}
+
 function cleanToken(value) {
-  return (value ?? "")
-    .normalize("NFD")
-    .replace(/\p{Diacritic}/gu, "")
-    .replace(/[^A-Za-z0-9]+/g, "")
+  return stripAccents(value ?? "")
+    .replace(NON_ALNUM_PATTERN, "")
     .toUpperCase();
 }
 
 function cleanName(value) {
   return (value ?? "")
-    .replace(/\s+/g, " ")
-    .replace(/\s+\$/g, " $")
+    .replace(WHITESPACE_PATTERN, " ")
+    .replace(SPACE_BEFORE_PRICE_PATTERN, " $")
     .trim();
 }
 
 function normalizeNameKey(value) {
-  return cleanName(value)
-    .normalize("NFD")
-    .replace(/\p{Diacritic}/gu, "")
-    .replace(/[^a-zA-Z0-9\s]+/g, " ")
-    .replace(/\s+/g, " ")
+  return stripAccents(value ?? "")
+    .replace(NON_ALNUM_PATTERN, " ")
     .trim()
     .toLowerCase();
 }
@@ -119,46 +185,47 @@ function readCategory(row) {
   return row?.category ?? row?.categoria ?? "";
 }
 
+const categoryCodeCache = new Map();
+
 function categoryCode(category) {
+  const cached = categoryCodeCache.get(category);
+  if (cached !== undefined) return cached;
   const normalized = cleanToken(category);
-  if (!normalized) return "GENR";
-  if (normalized.startsWith("CAMI")) return "CAMI";
-  if (normalized.startsWith("PANT")) return "PANT";
-  if (normalized.startsWith("FALD")) return "FALD";
-  if (normalized.startsWith("ZAPA") || normalized.startsWith("CALZ")) return "ZAPA";
-  if (
-    normalized.startsWith("MONE") ||
-    normalized.startsWith("BOLS") ||
-    normalized.startsWith("CART")
-  ) {
-    return "MONE";
+  const prefix = normalized.slice(0, 4);
+  const code = !normalized
+    ? "GENR"
+    : (CATEGORY_CODE_BY_PREFIX.get(prefix) ?? prefix.padEnd(4, "X"));
+  categoryCodeCache.set(category, code);
+  return code;
+}
+
+function hasMinDigits(value, min) {
+  let count = 0;
+  for (let i = 0; i < value.length; i += 1) {
+    const code = value.charCodeAt(i);
+    if (code >= 48 && code <= 57) {
+      count += 1;
+      if (count >= min) return true;
+    }
   }
-  if (normalized.startsWith("PERF")) return "PERF";
-  if (normalized.startsWith("ACCE")) return "ACCE";
-  if (normalized.startsWith("VEST")) return "VEST";
-  if (normalized.startsWith("BERM")) return "BERM";
-  return normalized.slice(0, 4).padEnd(4, "X");
+  return false;
 }
 
 function normalizeReference(value) {
   const normalized = cleanToken(value);
   if (!normalized) return "";
-  const digits = normalized.replace(/\D/g, "");
-  if (digits.length < 3) return "";
+  if (!hasMinDigits(normalized, 3)) return "";
   return normalized;
 }
 
 function isSyntheticReference(value) {
   const normalized = normalizeReference(value);
   if (!normalized) return true;
-  if (/^P\d+R\d+$/i.test(normalized)) return true;
-  if (/^MISSING/i.test(normalized)) return true;
-  if (/^MANUAL/i.test(normalized)) return true;
-  return false;
+  return SYNTHETIC_REFERENCE_PATTERN.test(normalized);
 }
 
 function extractReferenceFromName(name) {
-  const match = String(name ?? "").match(/\(([^)]+)\)/);
+  const match = String(name ?? "").match(REFERENCE_PAREN_PATTERN);
   if (!match) return "";
   return normalizeReference(match[1]);
 }
@@ -171,7 +238,7 @@ function extractReferenceFromSku(sku) {
 
 function extractReferenceFromImageFilename(imageFilename) {
   const value = String(imageFilename ?? "");
-  const match = value.match(/-(\d{3,})-[^-]+\.[A-Za-z0-9]+$/);
+  const match = value.match(IMAGE_REFERENCE_PATTERN);
   return match ? normalizeReference(match[1]) : "";
 }
 
@@ -183,43 +250,42 @@ function makeSku(category, reference, size) {
 }
 
 function flagNameNoise(name) {
-  return /Tallas?|[$]/i.test(name);
+  return NAME_NOISE_PATTERN.test(name);
 }
 
 function chooseReference(staging, current, fallbackIndex) {
   const candidates = [
     {
-      value: normalizeReference(staging?.reference_number),
+      read: () => normalizeReference(staging?.reference_number),
       source: "pdf",
     },
     {
-      value: normalizeReference(extractReferenceFromName(staging?.name_raw || "")),
+      read: () => extractReferenceFromName(staging?.name_raw || ""),
       source: "pdf_name",
     },
     {
-      value: normalizeReference(current?.reference_number),
+      read: () => normalizeReference(current?.reference_number),
       source: "catalog_reference",
     },
     {
-      value: normalizeReference(extractReferenceFromName(current?.name || "")),
+      read: () => extractReferenceFromName(current?.name || ""),
       source: "catalog_name",
     },
     {
-      value: normalizeReference(extractReferenceFromSku(current?.sku || "")),
+      read: () => extractReferenceFromSku(current?.sku || ""),
       source: "catalog_sku",
     },
     {
-      value: normalizeReference(
-        extractReferenceFromImageFilename(current?.image_filename || ""),
-      ),
+      read: () => extractReferenceFromImageFilename(current?.image_filename || ""),
       source: "image_filename",
     },
   ];
 
   for (const candidate of candidates) {
-    if (!candidate.value) continue;
-    if (isSyntheticReference(candidate.value)) continue;
-    return candidate;
+    const value = candidate.read();
+    if (!value) continue;
+    if (isSyntheticReference(value)) continue;
+    return { value, source: candidate.source };
   }
 
   return {
@@ -228,10 +294,11 @@ function chooseReference(staging, current, fallbackIndex) {
   };
 }
 
-function tokenOverlapScore(a, b) {
-  if (!a || !b) return 0;
-  const aTokens = new Set(a.split(" ").filter(Boolean));
-  const bTokens = new Set(b.split(" ").filter(Boolean));
+function toNameTokens(nameKey) {
+  return new Set(nameKey.split(" ").filter(Boolean));
+}
+
+function tokenOverlapScore(aTokens, bTokens) {
   let overlap = 0;
   for (const token of aTokens) {
     if (bTokens.has(token)) overlap += 1;
@@ -241,6 +308,7 @@ function tokenOverlapScore(a, b) {
 
 function pickStagingMatch(current, stagingPool, fallbackIndexRef) {
   const currentNameKey = normalizeNameKey(current?.name || "");
+  const currentNameTokens = toNameTokens(currentNameKey);
   const currentSizeKey = cleanToken(current?.size || "UNICA") || "UNICA";
 
   let bestIndex = -1;
@@ -261,7 +329,7 @@ function pickStagingMatch(current, stagingPool, fallbackIndexRef) {
     ) {
       score += 8;
     } else {
-      score += tokenOverlapScore(candidate.nameKey, currentNameKey);
+      score += tokenOverlapScore(candidate.nameTokens, currentNameTokens);
     }
 
     if (score > bestScore) {
@@ -311,7 +379,7 @@ function main() {
   const photoFiles = new Set(
     fs
       .readdirSync(photosDir)
-      .filter((name) => /\.(jpg|jpeg|png|webp|avif)$/i.test(name)),
+      .filter((name) => PHOTO_EXTENSION_PATTERN.test(name)),
   );
 
   const stagingByPage = new Map();
@@ -337,12 +405,16 @@ function main() {
   for (const page of sortedPages) {
     const pageRows = catalogByPage.get(page) ?? [];
     const stagingPageRows = stagingByPage.get(page) ?? [];
-    const stagingPool = stagingPageRows.map((row) => ({
-      row,
-      used: false,
-      nameKey: normalizeNameKey(row.name_raw || ""),
-      sizeKey: cleanToken(row.size || "UNICA") || "UNICA",
-    }));
+    const stagingPool = stagingPageRows.map((row) => {
+      const nameKey = normalizeNameKey(row.name_raw || "");
+      return {
+        row,
+        used: false,
+        nameKey,
+        nameTokens: toNameTokens(nameKey),
+        sizeKey: cleanToken(row.size || "UNICA") || "UNICA",
+      };
+    });
     const fallbackIndexRef = { value: 0 };
 
     for (let idx = 0; idx < pageRows.length; idx += 1) {
@@ -404,92 +476,29 @@ function main() {
         review_notes: notes.join("|"),
       });
 
-      finalRows.push({
-        sku: skuFinal,
-        name: nameFinal,
-        category: categoryFinal,
-        size: sizeFinal,
-        color: current.color || "",
-        price: priceFinal,
-        cost: current.cost || "",
-        initial_stock: current.initial_stock || "0",
-        image_filename: imageFilename,
-        reference_number: referenceFinal,
-        reference_source: selectedRef.source,
-        source_page: page,
-      });
+      finalRows.push([
+        skuFinal,
+        nameFinal,
+        categoryFinal,
+        sizeFinal,
+        current.color || "",
+        priceFinal,
+        current.cost || "",
+        current.initial_stock || "0",
+        imageFilename,
+        referenceFinal,
+        selectedRef.source,
+        page,
+      ]);
     }
   }
 
-  writeCsv(
-    reviewPath,
-    [
-      "source_page",
-      "sku_current",
-      "sku_suggested",
-      "reference_number",
-      "reference_source",
-      "name_current",
-      "name_pdf",
-      "name_suggested",
-      "category_current",
-      "category_suggested",
-      "size_current",
-      "size_suggested",
-      "price_current",
-      "price_pdf",
-      "image_filename_current",
-      "image_filename_suggested",
-      "review_status",
-      "review_notes",
-    ],
-    reviewRows,
-  );
+  writeCsv(reviewPath, REVIEW_HEADERS, reviewRows);
 
   const pendingRows = reviewRows.filter((row) => row.review_status !== "auto_ok");
-  writeCsv(
-    pendingPath,
-    [
-      "source_page",
-      "sku_current",
-      "sku_suggested",
-      "reference_number",
-      "reference_source",
-      "name_current",
-      "name_pdf",
-      "name_suggested",
-      "category_current",
-      "category_suggested",
-      "size_current",
-      "size_suggested",
-      "price_current",
-      "price_pdf",
-      "image_filename_current",
-      "image_filename_suggested",
-      "review_status",
-      "review_notes",
-    ],
-    pendingRows,
-  );
+  writeCsv(pendingPath, REVIEW_HEADERS, pendingRows);
 
-  writeCsv(
-    finalPath,
-    [
-      "sku",
-      "name",
-      "category",
-      "size",
-      "color",
-      "price",
-      "cost",
-      "initial_stock",
-      "image_filename",
-      "reference_number",
-      "reference_source",
-      "source_page",
-    ],
-    finalRows,
-  );
+  writeCsv(finalPath, FINAL_HEADERS, finalRows);
 
   const pending = pendingRows.length;
   const fromPdf = reviewRows.filter((row) => row.reference_source === "pdf").length;
@@ -75,7 +75,8 @@ function writeCsv(filePath, headers, rows) {
   fs.mkdirSync(path.dirname(filePath), { recursive: true });
   const lines = [headers.join(",")];
   for (const row of rows) {
-    lines.push(headers.map((header) => csvEscape(row[header] ?? "")).join(","));
+    const values = Array.isArray(row) ? row : headers.map((header) => row[header]);
+    lines.push(values.map((value) => csvEscape(value ?? "")).join(","));
   }
   fs.writeFileSync(filePath, lines.join("\n"), "utf8");
 }
@@ -308,11 +309,16 @@ function loadCategoryOverrides(filePath) {
     throw new Error(`category-overrides.csv invalido; faltan columnas: ${missing.join(", ")}`);
   }
   return rows
-    .map((row) => ({
-      match_type: normalizeSpaces(row.match_type).toLowerCase(),
-      match_value: normalizeSpaces(row.match_value),
-      category: normalizeSpaces(row.category),
-    }))
+    .map((row) => {
+      const matchValue = normalizeSpaces(row.match_value);
+      return {
+        match_type: normalizeSpaces(row.match_type).toLowerCase(),
+        match_value: matchValue,
+        match_value_upper: matchValue.toUpperCase(),
+        match_value_key: normalizeTextKey(matchValue),
+        category: normalizeSpaces(row.category),
+      };
+    })
     .filter((row) => row.match_type && row.match_value && row.category);
 }
 
@@ -322,8 +328,8 @@ function applyCategoryOverride(group, overrides) {
   const skuKey = String(group.sku ?? "").trim().toUpperCase();
   const vendorKey = String(group.vendor_code_normalized ?? "").trim().toUpperCase();
   for (const rule of overrides) {
-    const valueUpper = rule.match_value.toUpperCase();
-    const valueNameKey = normalizeTextKey(rule.match_value);
+    const valueUpper = rule.match_value_upper;
+    const valueNameKey = rule.match_value_key;
     if (rule.match_type === "sku" && skuKey && skuKey === valueUpper) return rule;
     if (rule.match_type === "vendor_code" && vendorKey && vendorKey === valueUpper) return rule;
     if (rule.match_type === "name_exact" && nameKey === valueNameKey) return rule;
@@ -850,28 +856,28 @@ function finalizeGroupFields(groups, { categoryOverrides, allowSyntheticSkus })
 }
 
 function toOutputRow(group) {
-  return {
-    sku: group.sku || "",
-    name: group.name || "",
-    category: group.category || "",
-    size: group.size || "UNICA",
-    color: group.color || "",
-    price: group.price || "",
-    cost: "",
-    initial_stock: String(group.initial_stock ?? ""),
-    image_filename: group.image_filename || "",
-    reference_number: group.reference_number || "",
-    reference_source: group.reference_source || "",
-    vendor_code_raw: group.vendor_code_raw || "",
-    vendor_code_normalized: group.vendor_code_normalized || "",
-    source_store: group.source_store || "",
-    source_invoice_examples: group.source_invoice_examples || "",
-    grouped_row_count: String(group.grouped_row_count ?? ""),
-    sku_collision_applied: group.sku_collision_applied ? "true" : "false",
-    synthetic_sku: group.synthetic_sku || "",
-    category_rule: group.category_rule || "",
-    source_line_examples: group.source_line_examples || "",
-  };
+  return [
+    group.sku || "",
+    group.name || "",
+    group.category || "",
+    group.size || "UNICA",
+    group.color || "",
+    group.price || "",
+    "",
+    String(group.initial_stock ?? ""),
+    group.image_filename || "",
+    group.reference_number || "",
+    group.reference_source || "",
+    group.vendor_code_raw || "",
+    group.vendor_code_normalized || "",
+    group.source_store || "",
+    group.source_invoice_examples || "",
+    String(group.grouped_row_count ?? ""),
+    group.sku_collision_applied ? "true" : "false",
+    group.synthetic_sku || "",
+    group.category_rule || "",
+    group.source_line_examples || "",
+  ];
 }
 
 function main() {
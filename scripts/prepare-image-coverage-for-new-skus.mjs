@@ -181,8 +181,8 @@ function loadReferenceCatalog(filePath, photosByName) {
       image_filename: imageFilename,
       sku: normalizeSpaces(row.sku),
     };
-    const keyExact = `${normalizeTextKey(name)}||${size}||${normalizeColorKey(color)}`;
     const keyNameSize = `${normalizeTextKey(name)}||${size}`;
+    const keyExact = `${keyNameSize}||${normalizeColorKey(color)}`;
 
     if (!exactKeyMap.has(keyExact)) exactKeyMap.set(keyExact, []);
     exactKeyMap.get(keyExact).push(record);
@@ -408,8 +408,8 @@ function main() {
     }
 
     if (referenceCatalog && targetName) {
-      const keyExact = `${normalizeTextKey(targetName)}||${targetSize}||${normalizeColorKey(targetColor)}`;
       const keyNameSize = `${normalizeTextKey(targetName)}||${targetSize}`;
+      const keyExact = `${keyNameSize}||${normalizeColorKey(targetColor)}`;
       const exactRefMatches = referenceCatalog.exactKeyMap.get(keyExact) ?? [];
       const nameSizeRefMatches = referenceCatalog.nameSizeMap.get(keyNameSize) ?? [];
 
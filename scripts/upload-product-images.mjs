@@ -3,6 +3,7 @@ import path from "node:path";
 import { createClient } from "@supabase/supabase-js";
 
 const IMAGE_EXTENSIONS = new Set([".jpg", ".jpeg", ".png", ".webp", ".avif"]);
+const DEFAULT_CONCURRENCY = 1;
 
 function loadDotEnv() {
   const envFiles = [".env.local", ".env"];
@@ -70,6 +71,26 @@ function inferContentType(fileName) {
   }
 }
 
+function parseConcurrency(value) {
+  const parsed = Number(value ?? DEFAULT_CONCURRENCY);
+  if (!Number.isInteger(parsed) || parsed < 1) {
+    throw new Error("--concurrency debe ser un entero mayor o igual a 1.");
+  }
+  return parsed;
+}
+
+async function runWithConcurrency(items, limit, worker) {
+  let nextIndex = 0;
+  const runners = Array.from({ length: Math.min(limit, items.length) }, async () => {
+    while (nextIndex < items.length) {
+      const index = nextIndex;
+      nextIndex += 1;
+      await worker(items[index], index);
+    }
+  });
+  await Promise.all(runners);
+}
+
 function ensureEnv() {
   const url = process.env.SUPABASE_URL ?? process.env.VITE_SUPABASE_URL;
   const serviceRole = process.env.SUPABASE_SERVICE_ROLE_KEY;
@@ -95,9 +116,10 @@ async function main() {
 
   if (!dir) {
     throw new Error(
-      "Uso: npm run upload:images -- --dir <carpeta> [--bucket product-images] [--prefix temporada] [--output images-manifest.json] [--upsert true|false (default true)]"
+      "Uso: npm run upload:images -- --dir <carpeta> [--bucket product-images] [--prefix temporada] [--output images-manifest.json] [--upsert true|false (default true)] [--concurrency 1]"
     );
   }
+  const concurrency = parseConcurrency(args.get("concurrency"));
 
   const fullDir = path.resolve(dir);
   if (!fs.existsSync(fullDir)) {
@@ -119,10 +141,11 @@ async function main() {
     files: {},
   };
 
-  for (const fileName of files) {
+  const publicUrls = new Array(files.length);
+  await runWithConcurrency(files, concurrency, async (fileName, index) => {
     const localPath = path.join(fullDir, fileName);
     const storagePath = prefix ? `${prefix}/${fileName}` : fileName;
-    const content = fs.readFileSync(localPath);
+    const content = await fs.promises.readFile(localPath);
 
     const { error } = await supabase.storage.from(bucket).upload(storagePath, content, {
       contentType: inferContentType(fileName),
@@ -134,9 +157,13 @@ async function main() {
     }
 
     const { data } = supabase.storage.from(bucket).getPublicUrl(storagePath);
-    manifest.files[fileName] = data.publicUrl;
+    publicUrls[index] = data.publicUrl;
     console.log(`OK: ${fileName} -> ${data.publicUrl}`);
-  }
+  });
+
+  files.forEach((fileName, index) => {
+    manifest.files[fileName] = publicUrls[index];
+  });
 
   fs.writeFileSync(path.resolve(output), JSON.stringify(manifest, null, 2), "utf8");
   console.log(`Manifest generado: ${path.resolve(output)}`);
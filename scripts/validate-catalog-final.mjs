@@ -9,14 +9,12 @@ const SUPPORTED_IMAGE_EXTENSIONS = new Set([
   ".avif",
 ]);
 const FORBIDDEN_SKU_CHARS = /[,"\r\n]/;
+const PLACEHOLDER_REFERENCE_PATTERN = /^(?:P\d+R\d+$|MISSING|MANUAL)/i;
 
 function isPlaceholderReference(value) {
   const normalized = normalizeToken(value);
   if (!normalized) return true;
-  if (/^P\d+R\d+$/i.test(normalized)) return true;
-  if (/^MISSING/i.test(normalized)) return true;
-  if (/^MANUAL/i.test(normalized)) return true;
-  return false;
+  return PLACEHOLDER_REFERENCE_PATTERN.test(normalized);
 }
 
 function parseArgs(argv) {